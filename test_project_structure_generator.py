@@ -0,0 +1,112 @@
+"""
+Tests for project_structure_generator.py.
+
+Run with: python -m pytest -q
+"""
+
+import json
+import os
+import random
+import re
+import stat
+
+import pytest
+
+import project_structure_generator as psg
+
+# The tree-line regex used before the parser was rewritten with plain string operations.
+ORIGINAL_PATTERN = re.compile(r"^([\s│]*)(├── |└── )(.+)$")
+
+
+def original_classify(line: str):
+    """Classifies a line the way the original regex-based parser did."""
+    match = ORIGINAL_PATTERN.match(line)
+    if not match:
+        return None
+    indent, _, name_with_comment = match.groups()
+    name = name_with_comment.split("#")[0].strip()
+    level = len(indent.replace("│", " ")) // 4 + 1
+    is_dir = name.endswith("/")
+    if is_dir:
+        name = name.rstrip("/")
+    if not name:
+        return None
+    return level, is_dir, name
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("├── README.md", (1, False, "README.md")),
+    ("└── config/", (1, True, "config")),
+    ("│   └── config.yaml           # comment", (2, False, "config.yaml")),
+    ("│\xa0\xa0 ├── main.py", (2, False, "main.py")),
+    ("　　　　├── x", (2, False, "x")),
+    ("├── # note", None),
+    ("├── /", None),
+    ("└├── x", None),
+    ("not a branch", None),
+])
+def test_classify_line_examples(line, expected):
+    assert psg._classify_line(line) == expected
+    assert original_classify(line) == expected
+
+
+def test_classify_line_matches_original_regex():
+    alphabet = [" ", "\t", "\xa0", "　", " ", "\x0b", "\x0c", "\x1c", "\x85",
+                "│", "├── ", "└── ", "─", "├", "└", "a", "b/", "#", "é", ".py", " x", "/"]
+    rng = random.Random(0)
+    for _ in range(50000):
+        line = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 9))).rstrip()
+        if line:
+            assert psg._classify_line(line) == original_classify(line), repr(line)
+
+
+def test_parse_tree_text_strips_unicode_whitespace(tmp_path):
+    # Tree output pasted from a web page often carries non-breaking spaces at line ends.
+    config = tmp_path / "tree.txt"
+    config.write_text("proj/\xa0\n\xa0　\n├── a.py\xa0\n└── b/\n    └── c\n", encoding="utf-8")
+    project_name, structure = psg.parse_tree_text(str(config))
+    assert project_name == "proj"
+    assert structure.ops == [(1, False, "a.py"), (1, True, "b"), (2, False, "c")]
+
+
+def test_create_structure_with_separator_in_name(tmp_path):
+    base = tmp_path / "proj"
+    psg.ProjectStructureCreator(str(base), {"a/b": {"c": None}}).run()
+    assert (base / "a" / "b" / "c").is_file()
+
+
+def test_created_modes_follow_umask(tmp_path):
+    old_umask = os.umask(0o002)
+    try:
+        base = tmp_path / "proj"
+        psg.ProjectStructureCreator(str(base), {"src": {"main.py": None}}).run()
+    finally:
+        os.umask(old_umask)
+    assert stat.S_IMODE((base / "src").stat().st_mode) == 0o775
+    assert stat.S_IMODE((base / "src" / "main.py").stat().st_mode) == 0o664
+
+
+def test_config_cache_rejects_other_versions(tmp_path):
+    config = tmp_path / "tree.txt"
+    config.write_text("proj/\n└── a.py\n", encoding="utf-8")
+    cache = tmp_path / ("tree.txt" + psg.CACHE_SUFFIX)
+    assert psg.load_structure_from_file(str(config))[1].ops == [(1, False, "a.py")]
+    payload = json.loads(cache.read_text())
+    assert payload["version"] == psg.CACHE_VERSION
+    payload["version"] = psg.CACHE_VERSION + 1
+    payload["ops"] = [[1, False, "stale.py"]]
+    cache.write_text(json.dumps(payload))
+    assert psg.load_structure_from_file(str(config))[1].ops == [(1, False, "a.py")]
+
+
+def test_json_configs_are_not_cached(tmp_path):
+    config = tmp_path / "structure.json"
+    config.write_text('{"src": {"main.py": null}}', encoding="utf-8")
+    assert psg.load_structure_from_file(str(config)) == (None, {"src": {"main.py": None}})
+    assert not (tmp_path / ("structure.json" + psg.CACHE_SUFFIX)).exists()
+
+
+def test_create_structure_accepts_path(tmp_path):
+    creator = psg.ProjectStructureCreator(str(tmp_path), {})
+    creator.create_structure(tmp_path / "proj", {"src": {"main.py": None}})
+    assert (tmp_path / "proj" / "src" / "main.py").is_file()